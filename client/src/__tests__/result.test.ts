@@ -149,6 +149,21 @@ describe('LemmatizationResultImpl', () => {
       expect(token.is_alpha).toBe(true);
       expect(token.is_stop).toBe(false);
     });
+
+    it('should accept native boolean values', () => {
+      const responseWithBooleans: LemmatizeResponse = {
+        annotations: ['text', 'lemma', 'is_alpha', 'is_stop'],
+        tokens: [[['Hello', 'hello', true, false]]],
+        model: 'test',
+        processing_time_ms: 0,
+      };
+
+      const result = new LemmatizationResultImpl(responseWithBooleans);
+      const token = result.documents[0].tokens[0];
+
+      expect(token.is_alpha).toBe(true);
+      expect(token.is_stop).toBe(false);
+    });
   });
 });
 
@@ -38,7 +38,7 @@ export class BatchProcessor {
 
     const totalBatches = Math.ceil(texts.length / this.config.batchSize);
     const allAnnotations: string[] = [];
-    const allTokens: string[][][] = [];
+    const allTokens: (string | boolean)[][][] = [];
     let totalProcessingTime = 0;
 
     for (let i = 0; i < totalBatches; i++) {
@@ -19,8 +19,10 @@ function parseResponse(response: LemmatizeResponse): Document[] {
       response.annotations.forEach((fieldName, index) => {
         const value = tokenValues[index];
 
-        // Parse boolean fields
-        if (fieldName.startsWith('is_')) {
+        // Parse boolean fields (native booleans, or strings from older servers)
+        if (typeof value === 'boolean') {
+          token[fieldName] = value;
+        } else if (fieldName.startsWith('is_')) {
           token[fieldName] = value === 'true' || value === 'True';
         } else {
           token[fieldName] = value;
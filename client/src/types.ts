@@ -35,7 +35,7 @@ export interface LemmatizeResponse {
   /** List of field names in order */
   annotations: string[];
   /** Array of documents, each containing tokens with field values */
-  tokens: string[][][];
+  tokens: (string | boolean)[][][];
   /** Model used for processing */
   model: string;
   /** Processing time in milliseconds */
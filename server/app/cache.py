@@ -0,0 +1,78 @@
+"""Bounded LRU cache for serialized responses."""
+
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+
+class ResponseCache:
+    """LRU cache mapping request body digests to encoded response bodies.
+
+    Bounded both by entry count and by the total size of cached bodies.
+    """
+
+    def __init__(self, max_size: int, max_bytes: int):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[bytes, bytes] = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def make_key(body: bytes) -> bytes:
+        """Compute the cache key for a raw request body.
+
+        Args:
+            body: Raw request body
+
+        Returns:
+            Fixed-size digest of the body
+        """
+        return hashlib.blake2b(body, digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Get a cached response, marking it as most recently used.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Encoded response body or None if not cached
+        """
+        content = self._entries.get(key)
+        if content is not None:
+            self._entries.move_to_end(key)
+        return content
+
+    def put(self, key: bytes, content: bytes) -> None:
+        """Store a response, evicting the least recently used entries.
+
+        Responses larger than the whole byte budget are not cached.
+
+        Args:
+            key: Cache key from make_key
+            content: Encoded response body
+        """
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        if len(content) > self.max_bytes:
+            return
+
+        self._entries[key] = content
+        self._bytes += len(content)
+        while len(self._entries) > self.max_size or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached response bodies."""
+        return self._bytes
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -26,6 +26,13 @@ class Settings(BaseSettings):
     
     # Performance
     disable_pipeline_components: list[str] = ["parser", "ner"]
+    max_inflight_requests: int = 4  # Concurrent nlp.pipe calls in worker threads
+    spacy_batch_size: Optional[int] = None  # Default: 64 for transformers, 128 otherwise
+    spacy_n_process: int = 1  # Values > 1 fork workers that each reload the model
+    inference_workers: int = 0  # Process pool size for inference (0 = worker threads)
+    lemmatize_cache_enabled: bool = False  # Cache responses to identical requests
+    lemmatize_cache_max: int = 256  # Maximum cached /lemmatize responses
+    lemmatize_cache_max_bytes: int = 64 * 1024 * 1024  # Total size of cached responses
     
     # CORS
     cors_origins: list[str] = ["*"]
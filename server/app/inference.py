@@ -0,0 +1,288 @@
+"""Token extraction and process pool inference workers."""
+
+import logging
+import os
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Iterable, Union
+
+import numpy as np
+import orjson
+from spacy.attrs import DEP, ENT_TYPE, IS_ALPHA, IS_STOP, POS, TAG
+from spacy.tokens import Doc
+
+from .models import model_registry
+
+logger = logging.getLogger(__name__)
+
+# Boolean attributes, serialized as JSON booleans instead of string lookups
+BOOL_ATTRS = frozenset({IS_ALPHA, IS_STOP})
+
+# Closed-vocabulary attributes, sent as indices into a per-request vocab with
+# the "indexed" layout
+INTERNED_ATTRS = frozenset({POS, TAG, DEP, ENT_TYPE})
+
+
+def token_array(doc: Doc, attr_ids: tuple[int, ...]) -> np.ndarray:
+    """Read attributes into a (tokens, fields) array.
+
+    ``Doc.to_array`` drops the field axis when a single attribute is
+    requested, so the result is reshaped to always be two-dimensional.
+
+    Args:
+        doc: Processed spaCy document
+        attr_ids: spaCy attribute IDs, one per requested field
+
+    Returns:
+        Array with one row per token and one column per field
+    """
+    return doc.to_array(list(attr_ids)).reshape(len(doc), len(attr_ids))
+
+
+def extract_columns(doc: Doc, attr_ids: tuple[int, ...]) -> list[list[Union[str, bool]]]:
+    """Extract token field values from a document, one list per field.
+
+    All requested attributes are read in a single ``Doc.to_array`` call and
+    string IDs are resolved in bulk through the vocab's StringStore, instead
+    of going through per-token attribute accessors.
+
+    Args:
+        doc: Processed spaCy document
+        attr_ids: spaCy attribute IDs, one per requested field
+
+    Returns:
+        List of columns in ``attr_ids`` order, each holding one value per token
+    """
+    array = token_array(doc, attr_ids)
+    strings = doc.vocab.strings
+
+    columns: list = [None] * len(attr_ids)
+    for i, attr_id in enumerate(attr_ids):
+        column = array[:, i]
+        if attr_id in BOOL_ATTRS:
+            columns[i] = (column != 0).tolist()
+        else:
+            columns[i] = [strings[value] for value in column.tolist()]
+
+    return columns
+
+
+def extract_tokens(doc: Doc, attr_ids: tuple[int, ...]) -> list[list[Union[str, bool]]]:
+    """Extract token field values from a document in compact format.
+
+    Args:
+        doc: Processed spaCy document
+        attr_ids: spaCy attribute IDs, one per requested field
+
+    Returns:
+        List of tokens, each a list of field values in ``attr_ids`` order
+    """
+    # Fast path for string-only fields (including the defaults): resolve each
+    # distinct ID once, then let NumPy gather the rows
+    if BOOL_ATTRS.isdisjoint(attr_ids):
+        array = token_array(doc, attr_ids)
+        strings = doc.vocab.strings
+        unique_ids, inverse = np.unique(array, return_inverse=True)
+        names = np.array([strings[value] for value in unique_ids.tolist()], dtype=object)
+        return names[inverse.reshape(array.shape)].tolist()
+
+    return [list(row) for row in zip(*extract_columns(doc, attr_ids))]
+
+
+def extract_indexed(
+    docs: list[Doc],
+    attr_ids: tuple[int, ...],
+    annotations: tuple[str, ...]
+) -> tuple[dict[str, list[list[Any]]], dict[str, list[str]]]:
+    """Extract token values by field, interning closed-vocabulary fields.
+
+    Values of INTERNED_ATTRS fields are replaced by indices into a vocabulary
+    shared by all documents of the request; other fields are sent as values.
+
+    Args:
+        docs: Processed spaCy documents
+        attr_ids: spaCy attribute IDs, one per requested field
+        annotations: Field names matching ``attr_ids``
+
+    Returns:
+        Tuple of (field -> documents -> values, field -> vocabulary)
+    """
+    arrays = [token_array(doc, attr_ids) for doc in docs]
+    strings = docs[0].vocab.strings
+    ends = list(accumulate(len(array) for array in arrays))
+    starts = [0] + ends[:-1]
+    stacked = np.concatenate(arrays)
+
+    tokens = {}
+    vocab = {}
+    for i, (name, attr_id) in enumerate(zip(annotations, attr_ids)):
+        column = stacked[:, i]
+        if attr_id in INTERNED_ATTRS:
+            unique_ids, inverse = np.unique(column, return_inverse=True)
+            vocab[name] = [strings[value] for value in unique_ids.tolist()]
+            values = inverse.reshape(-1).tolist()
+        elif attr_id in BOOL_ATTRS:
+            values = (column != 0).tolist()
+        else:
+            values = [strings[value] for value in column.tolist()]
+        tokens[name] = [values[start:end] for start, end in zip(starts, ends)]
+
+    return tokens, vocab
+
+
+def build_token_payload(
+    docs: Iterable[Doc],
+    attr_ids: tuple[int, ...],
+    annotations: tuple[str, ...],
+    layout: str = "rows"
+) -> dict[str, Any]:
+    """Convert processed documents to token response fields.
+
+    Args:
+        docs: Processed spaCy documents
+        attr_ids: spaCy attribute IDs, one per requested field
+        annotations: Field names matching ``attr_ids``
+        layout: "rows" for documents -> tokens -> values, "columns" for
+            field -> documents -> values, or "indexed" for columns with
+            closed-vocabulary fields interned
+
+    Returns:
+        Response fields: "tokens", plus "vocab" for the indexed layout
+    """
+    if layout == "indexed":
+        docs = list(docs)
+        if not docs:
+            return {"tokens": {}, "vocab": {}}
+        tokens, vocab = extract_indexed(docs, attr_ids, annotations)
+        return {"tokens": tokens, "vocab": vocab}
+
+    if layout == "columns":
+        doc_columns = [extract_columns(doc, attr_ids) for doc in docs]
+        return {
+            "tokens": {
+                name: [columns[i] for columns in doc_columns]
+                for i, name in enumerate(annotations)
+            }
+        }
+
+    return {"tokens": [extract_tokens(doc, attr_ids) for doc in docs]}
+
+
+def encode_token_payload(
+    docs: Iterable[Doc],
+    attr_ids: tuple[int, ...],
+    annotations: tuple[str, ...],
+    layout: str = "rows"
+) -> dict[str, bytes]:
+    """Build token response fields and JSON-encode each of them.
+
+    Args:
+        docs: Processed spaCy documents
+        attr_ids: spaCy attribute IDs, one per requested field
+        annotations: Field names matching ``attr_ids``
+        layout: Token layout, see build_token_payload
+
+    Returns:
+        Response fields from build_token_payload, each JSON-encoded
+    """
+    payload = build_token_payload(docs, attr_ids, annotations, layout)
+    return {key: orjson.dumps(value) for key, value in payload.items()}
+
+
+def encode_ndjson(docs: Iterable[Doc], attr_ids: tuple[int, ...], start: int) -> bytes:
+    """Encode documents as NDJSON lines in row layout.
+
+    Args:
+        docs: Processed spaCy documents
+        attr_ids: spaCy attribute IDs, one per requested field
+        start: Index of the first document within the request
+
+    Returns:
+        One ``{"doc": index, "tokens": [...]}`` JSON line per document
+    """
+    return b"".join(
+        orjson.dumps({"doc": start + i, "tokens": extract_tokens(doc, attr_ids)}) + b"\n"
+        for i, doc in enumerate(docs)
+    )
+
+
+def init_worker(config_path: str) -> None:
+    """Load models inside a freshly spawned inference worker process.
+
+    Args:
+        config_path: Path to the models config file loaded by the server
+    """
+    model_registry.load_from_config(Path(config_path))
+    logger.info("Inference worker ready with models: %s", ", ".join(model_registry.list_models()))
+
+
+def worker_pid() -> int:
+    """Return the worker's process ID, used to start and warm up workers."""
+    return os.getpid()
+
+
+def _get_worker_model(model_name: str):
+    """Look up a model and its config loaded by init_worker.
+
+    Raises:
+        RuntimeError: If the model is not loaded in this worker
+    """
+    nlp = model_registry.get_model(model_name)
+    config = model_registry.get_model_config(model_name)
+    if not nlp or not config:
+        raise RuntimeError(f"Model '{model_name}' not loaded in inference worker")
+    return nlp, config
+
+
+def run_pipe(
+    model_name: str,
+    texts: list[str],
+    attr_ids: tuple[int, ...],
+    annotations: tuple[str, ...],
+    layout: str = "rows"
+) -> dict[str, bytes]:
+    """Process texts in an inference worker process.
+
+    Docs are converted to the compact token format inside the worker so only
+    the JSON-encoded response fields cross the process boundary.
+
+    Args:
+        model_name: Name of a model loaded by init_worker
+        texts: Texts to process
+        attr_ids: spaCy attribute IDs, one per requested field
+        annotations: Field names matching ``attr_ids``
+        layout: Token layout, see build_token_payload
+
+    Returns:
+        Response fields from build_token_payload, each JSON-encoded
+
+    Raises:
+        RuntimeError: If the model is not loaded in this worker
+    """
+    nlp, config = _get_worker_model(model_name)
+    docs = nlp.pipe(texts, batch_size=config.batch_size)
+    return encode_token_payload(docs, attr_ids, annotations, layout)
+
+
+def run_pipe_ndjson(
+    model_name: str,
+    texts: list[str],
+    attr_ids: tuple[int, ...],
+    start: int
+) -> bytes:
+    """Process a chunk of streamed texts in an inference worker process.
+
+    Args:
+        model_name: Name of a model loaded by init_worker
+        texts: Texts to process
+        attr_ids: spaCy attribute IDs, one per requested field
+        start: Index of the first text within the request
+
+    Returns:
+        NDJSON lines from encode_ndjson
+
+    Raises:
+        RuntimeError: If the model is not loaded in this worker
+    """
+    nlp, config = _get_worker_model(model_name)
+    return encode_ndjson(nlp.pipe(texts, batch_size=config.batch_size), attr_ids, start)
@@ -7,18 +7,35 @@ try:
 except ImportError:
     pass  # spacy-transformers is optional, only needed for transformer models
 
+import asyncio
 import logging
+import multiprocessing
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
+import orjson
 import spacy
-from fastapi import FastAPI, HTTPException, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from spacy.attrs import DEP, ENT_TYPE, IS_ALPHA, IS_STOP, LEMMA, ORTH, POS, TAG
 
 from . import __version__
+from .cache import ResponseCache
 from .config import settings
+from .inference import (
+    encode_ndjson,
+    encode_token_payload,
+    init_worker,
+    run_pipe,
+    run_pipe_ndjson,
+    worker_pid,
+)
+from .middleware import OriginGatedCORSMiddleware
 from .models import model_registry
 from .schemas import (
     ErrorResponse,
@@ -26,8 +43,8 @@ from .schemas import (
     InfoResponse,
     LemmatizeRequest,
     LemmatizeResponse,
-    ModelInfo,
     ModelsResponse,
+    parse_lemmatize_request,
 )
 
 # Configure logging
@@ -40,13 +57,139 @@ logger = logging.getLogger(__name__)
 # Track startup time
 startup_time = time.time()
 
+# Bound the number of nlp.pipe calls running in worker threads at once
+_pipe_semaphore = asyncio.Semaphore(settings.max_inflight_requests)
+
+# Optional process pool for inference, created at startup when enabled
+_inference_pool: Optional[ProcessPoolExecutor] = None
+_inference_config: Optional[str] = None
+
+# Strong references to fire-and-forget tasks, so they are not garbage collected
+_background_tasks: set[asyncio.Task] = set()
+
+# Optional cache of encoded /lemmatize responses, keyed by request body
+_response_cache: Optional[ResponseCache] = (
+    ResponseCache(settings.lemmatize_cache_max, settings.lemmatize_cache_max_bytes)
+    if settings.lemmatize_cache_enabled
+    else None
+)
+
+# Available token fields and their spaCy attribute IDs
+_FIELD_ATTRS: dict[str, int] = {
+    'text': ORTH,
+    'lemma': LEMMA,
+    'pos': POS,
+    'tag': TAG,
+    'dep': DEP,
+    'ent_type': ENT_TYPE,
+    'is_alpha': IS_ALPHA,
+    'is_stop': IS_STOP,
+}
+_VALID_FIELDS = frozenset(_FIELD_ATTRS)
+
+# Default fields (must-haves + commonly used)
+_DEFAULT_FIELDS = ('text', 'lemma', 'pos', 'tag', 'dep')
+
+
+@lru_cache(maxsize=64)
+def _resolve_fields(fields: tuple[str, ...]) -> tuple[tuple[int, ...], tuple[str, ...]]:
+    """Validate requested fields and resolve them to spaCy attribute IDs.
+
+    Results are memoized per field combination; invalid combinations raise
+    and are therefore never cached.
+
+    Args:
+        fields: Requested field names, in response order
+
+    Returns:
+        Tuple of (attribute IDs, field names)
+
+    Raises:
+        HTTPException: If any field is not available
+    """
+    invalid_fields = list(dict.fromkeys(f for f in fields if f not in _VALID_FIELDS))
+    if invalid_fields:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": f"Invalid fields: {', '.join(invalid_fields)}",
+                "available_fields": list(_FIELD_ATTRS)
+            }
+        )
+    return tuple(_FIELD_ATTRS[field] for field in fields), fields
+
+
+def _create_inference_pool(config_path: str) -> ProcessPoolExecutor:
+    """Create the inference worker pool; workers load models on start.
+
+    Args:
+        config_path: Path to the models config file loaded by each worker
+
+    Returns:
+        Process pool whose workers run init_worker
+    """
+    return ProcessPoolExecutor(
+        max_workers=settings.inference_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(config_path,)
+    )
+
+
+async def _warm_inference_pool(pool: ProcessPoolExecutor) -> None:
+    """Start every worker of a pool so models are loaded before use.
+
+    Workers are spawned lazily on submit, so one task is run per worker.
+
+    Args:
+        pool: Inference pool to warm up
+
+    Raises:
+        BrokenProcessPool: If a worker fails to start
+    """
+    loop = asyncio.get_running_loop()
+    pids = await asyncio.gather(*(
+        loop.run_in_executor(pool, worker_pid)
+        for _ in range(settings.inference_workers)
+    ))
+    logger.info("%s inference workers ready", len(set(pids)))
+
+
+async def _warm_restarted_pool(pool: ProcessPoolExecutor) -> None:
+    """Warm a replacement pool in the background, logging failures."""
+    try:
+        await _warm_inference_pool(pool)
+    except BrokenProcessPool as e:
+        logger.error("Restarted inference workers failed to start: %s", e)
+
+
+def _restart_inference_pool(broken: ProcessPoolExecutor) -> None:
+    """Replace a broken inference pool, once, if it is still the active one.
+
+    The replacement is warmed in a background task, so the failing request
+    is not held up by model loading.
+
+    Args:
+        broken: Pool that raised BrokenProcessPool
+    """
+    global _inference_pool
+
+    if _inference_pool is broken and _inference_config is not None:
+        broken.shutdown(wait=False)
+        _inference_pool = _create_inference_pool(_inference_config)
+        task = asyncio.get_running_loop().create_task(_warm_restarted_pool(_inference_pool))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
+    global _inference_pool, _inference_config
+
     # Startup
-    logger.info(f"Starting jsspacynlp server v{__version__}")
-    logger.info(f"spaCy version: {spacy.__version__}")
+    logger.info("Starting jsspacynlp server v%s", __version__)
+    logger.info("spaCy version: %s", spacy.__version__)
 
     # Load models from config
     config_dir = Path(settings.models_config_dir)
@@ -55,13 +198,13 @@ async def lifespan(app: FastAPI):
 
     # Try config.json first, fall back to config.default.json
     if config_file.exists():
-        logger.info(f"Looking for model config at: {config_file}")
+        logger.info("Looking for model config at: %s", config_file)
         config_to_load = config_file
     elif default_config_file.exists():
-        logger.info(f"config.json not found, using default: {default_config_file}")
+        logger.info("config.json not found, using default: %s", default_config_file)
         config_to_load = default_config_file
     else:
-        logger.warning(f"No config files found at {config_file} or {default_config_file}")
+        logger.warning("No config files found at %s or %s", config_file, default_config_file)
         logger.warning("Server will start without models")
         config_to_load = None
 
@@ -69,21 +212,39 @@ async def lifespan(app: FastAPI):
         try:
             model_registry.load_from_config(config_to_load)
         except Exception as e:
-            logger.error(f"Error loading models: {e}")
+            logger.error("Error loading models: %s", e)
             logger.warning("Server will start without models")
 
     loaded_models = model_registry.list_models()
     if loaded_models:
-        logger.info(f"Loaded models: {', '.join(loaded_models)}")
+        logger.info("Loaded models: %s", ", ".join(loaded_models))
     else:
         logger.warning("No models loaded. Please check configuration.")
 
+    # Start inference worker processes, each loading its own copy of the models
+    if settings.inference_workers > 0 and config_to_load and loaded_models:
+        logger.info("Starting %s inference worker processes", settings.inference_workers)
+        _inference_config = str(config_to_load)
+        _inference_pool = _create_inference_pool(_inference_config)
+
+        # Load models in the workers before the server reports healthy
+        try:
+            await _warm_inference_pool(_inference_pool)
+        except BrokenProcessPool as e:
+            logger.error("Inference workers failed to start, using in-process inference: %s", e)
+            _inference_pool.shutdown(wait=False)
+            _inference_pool = None
+
     logger.info("Server startup complete")
 
     yield
 
     # Shutdown
     logger.info("Shutting down jsspacynlp server")
+    if _inference_pool is not None:
+        _inference_pool.shutdown()
+        _inference_pool = None
+    _inference_config = None
 
 
 # Create FastAPI app
@@ -91,12 +252,13 @@ app = FastAPI(
     title="jsspacynlp",
     description="Fast lemmatization service powered by spaCy",
     version=__version__,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Add CORS middleware
+# Add CORS middleware, skipped for requests without an Origin header
 app.add_middleware(
-    CORSMiddleware,
+    OriginGatedCORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
@@ -153,35 +315,47 @@ async def list_models():
     Returns:
         List of loaded models with metadata
     """
-    model_names = model_registry.list_models()
-    model_infos = []
+    # Body is built once by the registry whenever the loaded models change
+    return Response(
+        content=model_registry.get_models_response(),
+        media_type="application/json"
+    )
 
-    for name in model_names:
-        info = model_registry.get_model_info(name)
-        if info:
-            model_infos.append(ModelInfo(**info))
 
-    return ModelsResponse(available_models=model_infos)
+# Request body documentation for endpoints that parse the raw body themselves
+_LEMMATIZE_REQUEST_BODY = {
+    "requestBody": {
+        "content": {
+            "application/json": {"schema": LemmatizeRequest.model_json_schema()}
+        },
+        "required": True
+    }
+}
 
 
-@app.post("/lemmatize", response_model=LemmatizeResponse)
-async def lemmatize(request: LemmatizeRequest):
-    """Lemmatize text using spaCy.
+async def _read_lemmatize_request(http_request: Request) -> LemmatizeRequest:
+    """Parse and validate a lemmatization request body.
 
     Args:
-        request: Lemmatization request with model name, texts, and optional fields
+        http_request: Raw request whose JSON body matches LemmatizeRequest
 
     Returns:
-        Compact JSON format with annotations and tokens
+        Validated lemmatization request
 
     Raises:
-        HTTPException: If model not found or processing fails
+        HTTPException: If request is invalid or model not found
     """
-    start_time = time.time()
+    # Parse body directly rather than through full Pydantic validation
+    try:
+        request = parse_lemmatize_request(await http_request.body())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"error": "Invalid request", "details": str(e)}
+        )
 
     # Validate model exists
-    nlp = model_registry.get_model(request.model)
-    if not nlp:
+    if not model_registry.get_model(request.model):
         available = model_registry.list_models()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -191,82 +365,184 @@ async def lemmatize(request: LemmatizeRequest):
             }
         )
 
-    # Validate batch size
-    if len(request.texts) > settings.max_batch_size:
+    # Validate text lengths, only locating the offending text on failure
+    lengths = list(map(len, request.texts))
+    if max(lengths) > settings.max_text_length:
+        i = next(i for i, length in enumerate(lengths) if length > settings.max_text_length)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
-                "error": f"Batch size {len(request.texts)} exceeds maximum {settings.max_batch_size}"
+                "error": f"Text at index {i} exceeds maximum length {settings.max_text_length}"
             }
         )
 
-    # Validate text lengths
-    for i, text in enumerate(request.texts):
-        if len(text) > settings.max_text_length:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "error": f"Text at index {i} exceeds maximum length {settings.max_text_length}"
-                }
-            )
+    return request
 
-    # Define available fields and their extractors
-    field_extractors = {
-        'text': lambda token: token.text,
-        'lemma': lambda token: token.lemma_,
-        'pos': lambda token: token.pos_,
-        'tag': lambda token: token.tag_,
-        'dep': lambda token: token.dep_,
-        'ent_type': lambda token: token.ent_type_,
-        'is_alpha': lambda token: str(token.is_alpha),
-        'is_stop': lambda token: str(token.is_stop),
-    }
+
+@app.post(
+    "/lemmatize",
+    responses={200: {"model": LemmatizeResponse}},
+    openapi_extra=_LEMMATIZE_REQUEST_BODY
+)
+async def lemmatize(http_request: Request):
+    """Lemmatize text using spaCy.
+
+    Args:
+        http_request: Raw request whose JSON body matches LemmatizeRequest
+
+    Returns:
+        Compact JSON format with annotations and tokens
+
+    Raises:
+        HTTPException: If request is invalid, model not found or processing fails
+    """
+    start_time = time.time()
+
+    # Serve identical requests from the cache, skipping parsing and inference
+    cache_key = None
+    if _response_cache is not None:
+        cache_key = ResponseCache.make_key(await http_request.body())
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+
+    request = await _read_lemmatize_request(http_request)
+    nlp = model_registry.get_model(request.model)
+    config = model_registry.get_model_config(request.model)
 
     # Determine which fields to include
-    if request.fields:
-        # Validate requested fields
-        invalid_fields = set(request.fields) - set(field_extractors.keys())
-        if invalid_fields:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "error": f"Invalid fields: {', '.join(invalid_fields)}",
-                    "available_fields": list(field_extractors.keys())
-                }
-            )
-        annotations = request.fields
-    else:
-        # Default fields (must-haves + commonly used)
-        annotations = ['text', 'lemma', 'pos', 'tag', 'dep']
+    attr_ids, annotations = _resolve_fields(
+        tuple(request.fields) if request.fields else _DEFAULT_FIELDS
+    )
 
-    # Process texts in batch
+    # Process texts and encode the token fields off the event loop; the
+    # encoded fields are embedded as-is in the response
+    pool = _inference_pool
     try:
-        docs = list(nlp.pipe(request.texts))
+        if pool is not None:
+            loop = asyncio.get_running_loop()
+            encoded = await loop.run_in_executor(
+                pool, run_pipe, request.model, request.texts,
+                attr_ids, annotations, request.layout
+            )
+        else:
+            async with _pipe_semaphore:
+                encoded = await asyncio.to_thread(lambda: encode_token_payload(
+                    nlp.pipe(
+                        request.texts,
+                        batch_size=config.batch_size,
+                        n_process=settings.spacy_n_process
+                    ),
+                    attr_ids,
+                    annotations,
+                    request.layout
+                ))
+        payload = {key: orjson.Fragment(value) for key, value in encoded.items()}
+    except BrokenProcessPool as e:
+        logger.error("Inference worker died, restarting worker pool: %s", e)
+        _restart_inference_pool(pool)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": "Inference workers restarting", "details": str(e)}
+        )
     except Exception as e:
-        logger.error(f"Error processing texts: {e}")
+        logger.error("Error processing texts: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"error": "Error processing texts", "details": str(e)}
         )
 
-    # Convert to compact format
-    all_tokens = []
-    for doc in docs:
-        doc_tokens = []
-        for token in doc:
-            token_data = [field_extractors[field](token) for field in annotations]
-            doc_tokens.append(token_data)
-        all_tokens.append(doc_tokens)
-
     processing_time = (time.time() - start_time) * 1000  # Convert to ms
 
-    return LemmatizeResponse(
-        annotations=annotations,
-        tokens=all_tokens,
-        model=request.model,
-        processing_time_ms=processing_time
+    # Token payloads can be large, so skip response model validation and
+    # serialize directly; LemmatizeResponse documents the shape in OpenAPI
+    content = orjson.dumps({
+        "annotations": annotations,
+        **payload,
+        "model": request.model,
+        "processing_time_ms": processing_time
+    })
+    if cache_key is not None:
+        _response_cache.put(cache_key, content)
+
+    return Response(content=content, media_type="application/json")
+
+
+@app.post(
+    "/lemmatize/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+    openapi_extra=_LEMMATIZE_REQUEST_BODY
+)
+async def lemmatize_stream(http_request: Request):
+    """Lemmatize text using spaCy, streaming results as NDJSON.
+
+    The first line holds the annotations and model name; each following line
+    holds one document as ``{"doc": index, "tokens": [...]}`` in row layout.
+    Texts are processed in chunks of the model's batch size, so memory stays
+    bounded and results are sent while later chunks are still processing.
+    Chunks run on the inference worker pool when one is configured, otherwise
+    in a worker thread (``spacy_n_process`` is not used for streaming).
+
+    Args:
+        http_request: Raw request whose JSON body matches LemmatizeRequest
+
+    Returns:
+        Streaming NDJSON response
+
+    Raises:
+        HTTPException: If request is invalid or model not found
+    """
+    request = await _read_lemmatize_request(http_request)
+    nlp = model_registry.get_model(request.model)
+    config = model_registry.get_model_config(request.model)
+
+    if request.layout != "rows":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Streaming only supports the 'rows' layout"}
+        )
+
+    attr_ids, annotations = _resolve_fields(
+        tuple(request.fields) if request.fields else _DEFAULT_FIELDS
     )
 
+    async def generate():
+        yield orjson.dumps({"annotations": annotations, "model": request.model}) + b"\n"
+
+        texts = request.texts
+        for start in range(0, len(texts), config.batch_size):
+            chunk = texts[start:start + config.batch_size]
+            pool = _inference_pool
+            try:
+                if pool is not None:
+                    loop = asyncio.get_running_loop()
+                    lines = await loop.run_in_executor(
+                        pool, run_pipe_ndjson, request.model, chunk, attr_ids, start
+                    )
+                else:
+                    async with _pipe_semaphore:
+                        # No n_process here: spaCy would start new worker
+                        # processes for every chunk
+                        lines = await asyncio.to_thread(lambda: encode_ndjson(
+                            nlp.pipe(chunk, batch_size=config.batch_size),
+                            attr_ids,
+                            start
+                        ))
+            except BrokenProcessPool as e:
+                logger.error("Inference worker died, restarting worker pool: %s", e)
+                _restart_inference_pool(pool)
+                yield orjson.dumps({"error": "Inference workers restarting", "details": str(e)}) + b"\n"
+                return
+            except Exception as e:
+                # Status is already sent, so report the failure in-band
+                logger.error("Error processing texts: %s", e)
+                yield orjson.dumps({"error": "Error processing texts", "details": str(e)}) + b"\n"
+                return
+            yield lines
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -279,5 +555,12 @@ async def http_exception_handler(request, exc):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host=settings.host, port=settings.port)
+    # The default "auto" loop and HTTP parser pick uvloop and httptools when
+    # uvicorn[standard] installed them, and fall back where they are missing
+    uvicorn.run(
+        app,
+        host=settings.host,
+        port=settings.port,
+        log_level=settings.log_level.lower()
+    )
 
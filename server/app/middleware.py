@@ -0,0 +1,22 @@
+"""ASGI middleware for jsspacynlp server."""
+
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import Receive, Scope, Send
+
+
+class OriginGatedCORSMiddleware(CORSMiddleware):
+    """CORS middleware that bypasses CORS handling for non-CORS requests.
+
+    Server-to-server clients do not send an ``Origin`` header, so those
+    requests go straight to the app after a scan of the raw ASGI headers,
+    without building a Headers mapping.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not any(
+            name == b"origin" for name, _ in scope["headers"]
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        await super().__call__(scope, receive, send)
@@ -8,6 +8,7 @@ import sys
 from pathlib import Path
 from typing import Dict, Optional
 
+import orjson
 import spacy
 from spacy.language import Language
 
@@ -25,6 +26,7 @@ except ImportError:
     pass  # spacy-curated-transformers is optional, needed for en_core_web_trf etc.
 
 from .config import settings
+from .schemas import ModelInfo, ModelsResponse
 
 logger = logging.getLogger(__name__)
 
@@ -47,9 +49,19 @@ class ModelConfig:
         self.model_type = model_type
         self.path = path
         self.disable = disable or settings.disable_pipeline_components
+        self.batch_size = settings.spacy_batch_size or (
+            64 if model_type == "transformer" else 128
+        )
         self.download_url = download_url
         self.huggingface_repo = huggingface_repo
 
+        # Resolve where the model can be loaded from once, up front
+        is_absolute = os.path.isabs(path)
+        self.resolved_path = (
+            path if is_absolute else str(Path(settings.models_config_dir) / path)
+        )
+        self.is_package_name = not is_absolute and os.sep not in path and "/" not in path
+
 
 class ModelRegistry:
     """Registry for managing spaCy models."""
@@ -57,9 +69,14 @@ class ModelRegistry:
     def __init__(self):
         self.models: Dict[str, Language] = {}
         self.configs: Dict[str, ModelConfig] = {}
+        # Cached views, rebuilt whenever a model is added or removed
+        self._models_tuple: tuple[str, ...] = ()
+        self._model_infos: Dict[str, dict] = {}
+        self._models_response_bytes: bytes = b''
         self.models_download_dir = Path(settings.models_cache_dir)
         # Ensure download directory exists
         self.models_download_dir.mkdir(parents=True, exist_ok=True)
+        self._refresh_views()
 
     def load_from_config(self, config_path: Path) -> None:
         """Load models from configuration file.
@@ -68,7 +85,7 @@ class ModelRegistry:
             config_path: Path to config.json file
         """
         if not config_path.exists():
-            logger.warning(f"Config file not found: {config_path}")
+            logger.warning("Config file not found: %s", config_path)
             logger.info("No models will be loaded. Server will start without models.")
             return
 
@@ -76,7 +93,7 @@ class ModelRegistry:
             with open(config_path, 'r', encoding='utf-8') as f:
                 config_data = json.load(f)
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in config file: {e}")
+            logger.error("Invalid JSON in config file: %s", e)
             raise
 
         models_config = config_data.get('models', [])
@@ -84,7 +101,7 @@ class ModelRegistry:
             logger.warning("No models specified in config file")
             return
 
-        logger.info(f"Loading {len(models_config)} models from config...")
+        logger.info("Loading %s models from config...", len(models_config))
 
         for model_data in models_config:
             try:
@@ -99,11 +116,11 @@ class ModelRegistry:
                 )
                 self.load_model(config)
             except KeyError as e:
-                logger.error(f"Invalid model config, missing key: {e}")
+                logger.error("Invalid model config, missing key: %s", e)
             except Exception as e:
-                logger.error(f"Failed to load model {model_data.get('name', 'unknown')}: {e}")
+                logger.error("Failed to load model %s: %s", model_data.get("name", "unknown"), e)
 
-        logger.info(f"Successfully loaded {len(self.models)} models")
+        logger.info("Successfully loaded %s models", len(self.models))
 
     def _download_model_from_url(self, config: ModelConfig) -> bool:
         """Download and install model from URL using pip.
@@ -117,7 +134,7 @@ class ModelRegistry:
         if not config.download_url:
             return False
 
-        logger.info(f"Downloading model '{config.name}' from {config.download_url}...")
+        logger.info("Downloading model '%s' from %s...", config.name, config.download_url)
 
         try:
             # Use pip to install the model
@@ -126,10 +143,10 @@ class ModelRegistry:
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE
             )
-            logger.info(f"Successfully downloaded model '{config.name}'")
+            logger.info("Successfully downloaded model '%s'", config.name)
             return True
         except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to download model from {config.download_url}: {e}")
+            logger.error("Failed to download model from %s: %s", config.download_url, e)
             return False
 
     def _download_model_from_huggingface(self, config: ModelConfig) -> Optional[str]:
@@ -144,7 +161,7 @@ class ModelRegistry:
         if not config.huggingface_repo:
             return None
 
-        logger.info(f"Downloading model '{config.name}' from HuggingFace: {config.huggingface_repo}...")
+        logger.info("Downloading model '%s' from HuggingFace: %s...", config.name, config.huggingface_repo)
 
         try:
             from huggingface_hub import snapshot_download
@@ -159,10 +176,10 @@ class ModelRegistry:
                 local_dir_use_symlinks=False
             )
             
-            logger.info(f"Successfully downloaded model '{config.name}' to {downloaded_path}")
+            logger.info("Successfully downloaded model '%s' to %s", config.name, downloaded_path)
             return str(downloaded_path)
         except Exception as e:
-            logger.error(f"Failed to download from HuggingFace {config.huggingface_repo}: {e}")
+            logger.error("Failed to download from HuggingFace %s: %s", config.huggingface_repo, e)
             return None
 
     def load_model(self, config: ModelConfig) -> None:
@@ -171,39 +188,34 @@ class ModelRegistry:
         Args:
             config: Model configuration
         """
-        logger.info(f"Loading model '{config.name}' from '{config.path}'...")
+        logger.info("Loading model '%s' from '%s'...", config.name, config.path)
 
-        # Try loading the model first
+        # Try loading the model first: installed package, then local path
+        # (models config dir first, then the working directory)
         model_loaded = False
         nlp = None
 
-        try:
-            # Check if path is absolute or relative
-            model_path = config.path
-            if not os.path.isabs(model_path):
-                # Try as spaCy model name first
-                try:
-                    nlp = spacy.load(model_path, disable=config.disable)
-                    model_loaded = True
-                except OSError:
-                    # Try as relative path from models directory
-                    models_dir = Path(settings.models_config_dir)
-                    model_path = models_dir / model_path
-                    if Path(model_path).exists():
-                        nlp = spacy.load(str(model_path), disable=config.disable)
-                        model_loaded = True
-            else:
-                if Path(model_path).exists():
-                    nlp = spacy.load(model_path, disable=config.disable)
-                    model_loaded = True
-
-        except Exception as e:
-            logger.debug(f"Could not load model '{config.name}' from path: {e}")
-            model_loaded = False
+        if config.is_package_name and (
+            config.path.startswith("blank:") or spacy.util.is_package(config.path)
+        ):
+            source = config.path
+        elif Path(config.resolved_path).exists():
+            source = config.resolved_path
+        elif Path(config.path).exists():
+            source = config.path
+        else:
+            source = None
+
+        if source:
+            try:
+                nlp = spacy.load(source, disable=config.disable)
+                model_loaded = True
+            except Exception as e:
+                logger.debug("Could not load model '%s' from %s: %s", config.name, source, e)
 
         # If model not found, try downloading it
         if not model_loaded:
-            logger.info(f"Model '{config.name}' not found, attempting to download...")
+            logger.info("Model '%s' not found, attempting to download...", config.name)
             
             # Try download_url first (for pip-installable packages)
             if config.download_url:
@@ -213,7 +225,7 @@ class ModelRegistry:
                         nlp = spacy.load(config.path, disable=config.disable)
                         model_loaded = True
                     except Exception as e:
-                        logger.error(f"Failed to load model after download: {e}")
+                        logger.error("Failed to load model after download: %s", e)
             
             # Try HuggingFace if URL download didn't work
             if not model_loaded and config.huggingface_repo:
@@ -223,7 +235,7 @@ class ModelRegistry:
                         nlp = spacy.load(downloaded_path, disable=config.disable)
                         model_loaded = True
                     except Exception as e:
-                        logger.error(f"Failed to load model from HuggingFace download: {e}")
+                        logger.error("Failed to load model from HuggingFace download: %s", e)
 
         # Final check
         if not model_loaded or nlp is None:
@@ -232,14 +244,14 @@ class ModelRegistry:
             raise RuntimeError(error_msg)
 
         # Store the model
-        self.models[config.name] = nlp
-        self.configs[config.name] = config
+        self.add_model(config, nlp)
 
         # Log active components
         active_components = nlp.pipe_names
         logger.info(
-            f"Model '{config.name}' loaded successfully. "
-            f"Active components: {', '.join(active_components)}"
+            "Model '%s' loaded successfully. Active components: %s",
+            config.name,
+            ", ".join(active_components),
         )
 
     def get_model(self, name: str) -> Optional[Language]:
@@ -264,13 +276,60 @@ class ModelRegistry:
         """
         return self.configs.get(name)
 
-    def list_models(self) -> list[str]:
-        """Get list of loaded model names.
+    def add_model(self, config: ModelConfig, nlp: Language) -> None:
+        """Register a loaded model and refresh cached model views.
+
+        Args:
+            config: Model configuration
+            nlp: Loaded spaCy Language object
+        """
+        self.models[config.name] = nlp
+        self.configs[config.name] = config
+        self._model_infos[config.name] = {
+            'name': config.name,
+            'language': config.language,
+            'type': config.model_type,
+            'version': nlp.meta.get('version', 'unknown'),
+            'components': nlp.pipe_names
+        }
+        self._refresh_views()
+
+    def remove_model(self, name: str) -> None:
+        """Unregister a model and refresh cached model views.
+
+        Args:
+            name: Model name
+        """
+        self.models.pop(name, None)
+        self.configs.pop(name, None)
+        self._model_infos.pop(name, None)
+        self._refresh_views()
+
+    def _refresh_views(self) -> None:
+        """Rebuild cached model name tuple and serialized /models response."""
+        self._models_tuple = tuple(self.models.keys())
+        response = ModelsResponse(
+            available_models=[
+                ModelInfo(**self._model_infos[name]) for name in self._models_tuple
+            ]
+        )
+        self._models_response_bytes = orjson.dumps(response.model_dump())
+
+    def list_models(self) -> tuple[str, ...]:
+        """Get loaded model names.
 
         Returns:
-            List of model names
+            Tuple of model names
         """
-        return list(self.models.keys())
+        return self._models_tuple
+
+    def get_models_response(self) -> bytes:
+        """Get the pre-serialized /models response body.
+
+        Returns:
+            JSON-encoded ModelsResponse for all loaded models
+        """
+        return self._models_response_bytes
 
     def get_model_info(self, name: str) -> Optional[dict]:
         """Get detailed information about a model.
@@ -281,19 +340,7 @@ class ModelRegistry:
         Returns:
             Dictionary with model information or None
         """
-        nlp = self.get_model(name)
-        config = self.get_model_config(name)
-
-        if not nlp or not config:
-            return None
-
-        return {
-            'name': config.name,
-            'language': config.language,
-            'type': config.model_type,
-            'version': nlp.meta.get('version', 'unknown'),
-            'components': nlp.pipe_names
-        }
+        return self._model_infos.get(name)
 
 
 # Global model registry instance
@@ -1,45 +1,116 @@
 """Pydantic schemas for request/response validation."""
 
-from typing import Optional
-from pydantic import BaseModel, Field, field_validator
+from typing import Annotated, Literal, Optional, Union
+
+import orjson
+from pydantic import BaseModel, Field, StringConstraints
+
+from .config import settings
 
 
 class LemmatizeRequest(BaseModel):
     """Request schema for lemmatization endpoint."""
 
-    model: str = Field(..., description="Name of the spaCy model to use")
-    texts: list[str] = Field(..., description="List of texts to process")
+    model: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)] = Field(
+        ...,
+        description="Name of the spaCy model to use"
+    )
+    texts: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.max_batch_size,
+        description="List of texts to process"
+    )
     fields: Optional[list[str]] = Field(
         default=None,
         description="Fields to include in response (default: all available)"
     )
+    layout: Literal["rows", "columns", "indexed"] = Field(
+        default="rows",
+        description=(
+            "Token layout: 'rows' (documents -> tokens -> field values), "
+            "'columns' (field -> documents -> values) or 'indexed' (columns "
+            "with pos/tag/dep/ent_type as indices into 'vocab')"
+        )
+    )
+
 
-    @field_validator('texts')
-    @classmethod
-    def validate_texts(cls, v):
-        """Validate texts list."""
-        if not v:
-            raise ValueError("texts cannot be empty")
-        if len(v) > 1000:  # Will be configurable via settings
-            raise ValueError("Batch size exceeds maximum allowed")
-        return v
-
-    @field_validator('model')
-    @classmethod
-    def validate_model(cls, v):
-        """Validate model name."""
-        if not v or not v.strip():
-            raise ValueError("model name cannot be empty")
-        return v.strip()
+def parse_lemmatize_request(body: bytes) -> LemmatizeRequest:
+    """Parse a raw lemmatization request body.
+
+    Applies the LemmatizeRequest checks with plain type tests and builds the
+    model with ``model_construct``, skipping full Pydantic validation of
+    potentially large text batches.
+
+    Args:
+        body: Raw JSON request body
+
+    Returns:
+        Parsed LemmatizeRequest
+
+    Raises:
+        ValueError: If the body is not valid JSON or fails validation
+    """
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}") from e
+
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object")
+
+    model = data.get("model")
+    if not isinstance(model, str):
+        raise ValueError("model must be a string")
+    if not model.strip():
+        raise ValueError("model name cannot be empty")
+
+    texts = data.get("texts")
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        raise ValueError("texts must be a list of strings")
+    if not texts:
+        raise ValueError("texts cannot be empty")
+    if len(texts) > settings.max_batch_size:
+        raise ValueError(
+            f"Batch size {len(texts)} exceeds maximum {settings.max_batch_size}"
+        )
+
+    fields = data.get("fields")
+    if fields is not None and (
+        not isinstance(fields, list) or not all(isinstance(f, str) for f in fields)
+    ):
+        raise ValueError("fields must be a list of strings")
+
+    layout = data.get("layout", "rows")
+    if layout not in ("rows", "columns", "indexed"):
+        raise ValueError("layout must be 'rows', 'columns' or 'indexed'")
+
+    return LemmatizeRequest.model_construct(
+        model=model.strip(),
+        texts=texts,
+        fields=fields,
+        layout=layout
+    )
 
 
 class LemmatizeResponse(BaseModel):
     """Response schema for lemmatization endpoint."""
 
     annotations: list[str] = Field(..., description="List of field names in order")
-    tokens: list[list[list[str]]] = Field(
+    tokens: Union[
+        list[list[list[Union[str, bool]]]],
+        dict[str, list[list[Union[str, int, bool]]]]
+    ] = Field(
         ...,
-        description="List of documents, each containing tokens with field values"
+        description=(
+            "List of documents, each containing tokens with field values; with "
+            "the 'columns' and 'indexed' layouts, a mapping of field name to "
+            "per-document values"
+        )
+    )
+    vocab: Optional[dict[str, list[str]]] = Field(
+        None,
+        description="Per-field values referenced by index ('indexed' layout only)"
     )
     model: str = Field(..., description="Model used for processing")
     processing_time_ms: float = Field(..., description="Processing time in milliseconds")
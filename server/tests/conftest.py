@@ -1,5 +1,9 @@
 """Pytest configuration and fixtures."""
 
+import os
+import socket
+from urllib.parse import urlsplit
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -7,55 +11,79 @@ from app.main import app
 from app.models import model_registry, ModelConfig
 
 
-@pytest.fixture
+# Server URL used by the integration tests
+SERVER_URL = "http://localhost:8000"
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    """Skip integration tests up front when their server is not listening.
+
+    Runs after "-m" deselection, so the port is only probed when integration
+    tests were actually selected, and then once per session instead of a
+    readiness wait in every module.
+    """
+    integration = [item for item in items if "integration" in item.keywords]
+    if not integration or os.getenv("JSSPACY_IN_PROC"):
+        return
+
+    url = urlsplit(SERVER_URL)
+    try:
+        socket.create_connection((url.hostname, url.port or 80), timeout=0.5).close()
+    except OSError:
+        skip = pytest.mark.skip(reason=f"Server not available at {url.netloc}")
+        for item in integration:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def server_url():
+    """Base URL of the server under integration test."""
+    return SERVER_URL
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Test client fixture."""
-    return TestClient(app)
+    """Test client fixture.
 
+    Session-scoped and entered as a context manager, so the app lifespan
+    (model loading, worker pool) runs once for the whole test session.
+    """
+    with TestClient(app) as c:
+        yield c
 
-@pytest.fixture
-def mock_model(monkeypatch):
-    """Mock a simple spaCy model for testing."""
+
+@pytest.fixture(scope="session")
+def mock_model():
+    """Mock a simple spaCy model for testing.
+
+    Session-scoped: the model is built and registered once per test process
+    (each pytest-xdist worker has its own registry).
+    """
     import spacy
     from spacy.tokens import Doc
-    from spacy.vocab import Vocab
 
     # Create a simple blank model
     nlp = spacy.blank("en")
-    
-    # Add a simple lemmatizer
-    vocab = nlp.vocab
-    
-    # Mock tokens with lemmas
-    class MockToken:
-        def __init__(self, text, lemma, pos="NOUN", tag="NN", dep="ROOT"):
-            self.text = text
-            self.lemma_ = lemma
-            self.pos_ = pos
-            self.tag_ = tag
-            self.dep_ = dep
-            self.ent_type_ = ""
-            self.is_alpha = text.isalpha()
-            self.is_stop = False
-    
-    class MockDoc:
-        def __init__(self, text):
-            # Simple tokenization
-            words = text.split()
-            self.tokens = [
-                MockToken(word, word.lower(), "NOUN", "NN", "ROOT")
-                for word in words
-            ]
-        
-        def __iter__(self):
-            return iter(self.tokens)
-    
+
+    def make_doc(text):
+        # Simple whitespace tokenization with fixed annotations
+        words = text.split()
+        return Doc(
+            nlp.vocab,
+            words=words,
+            lemmas=[word.lower() for word in words],
+            pos=["NOUN"] * len(words),
+            tags=["NN"] * len(words),
+            deps=["ROOT"] * len(words),
+        )
+
     # Mock the nlp.pipe method
-    def mock_pipe(texts):
-        return [MockDoc(text) for text in texts]
-    
+    def mock_pipe(texts, **kwargs):
+        return [make_doc(text) for text in texts]
+
     nlp.pipe = mock_pipe
-    
+
     # Register the mock model
     config = ModelConfig(
         name="test_model",
@@ -63,14 +91,10 @@ def mock_model(monkeypatch):
         model_type="test",
         path="en_core_web_sm"
     )
-    model_registry.models["test_model"] = nlp
-    model_registry.configs["test_model"] = config
-    
+    model_registry.add_model(config, nlp)
+
     yield nlp
-    
+
     # Cleanup
-    if "test_model" in model_registry.models:
-        del model_registry.models["test_model"]
-    if "test_model" in model_registry.configs:
-        del model_registry.configs["test_model"]
+    model_registry.remove_model("test_model")
 
@@ -0,0 +1,50 @@
+"""Tests for response caching."""
+
+from app.cache import ResponseCache
+
+
+def test_response_cache_make_key():
+    """Test cache keys depend only on the request body."""
+    assert ResponseCache.make_key(b'{"a": 1}') == ResponseCache.make_key(b'{"a": 1}')
+    assert ResponseCache.make_key(b'{"a": 1}') != ResponseCache.make_key(b'{"a": 2}')
+
+
+def test_response_cache_evicts_least_recently_used():
+    """Test cache evicts the least recently used entry when full."""
+    cache = ResponseCache(max_size=2, max_bytes=1024)
+    cache.put(b"a", b"1")
+    cache.put(b"b", b"2")
+
+    # Touch "a" so "b" becomes least recently used
+    assert cache.get(b"a") == b"1"
+    cache.put(b"c", b"3")
+
+    assert len(cache) == 2
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == b"1"
+    assert cache.get(b"c") == b"3"
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_response_cache_evicts_by_size():
+    """Test cache stays within its byte budget and skips oversized responses."""
+    cache = ResponseCache(max_size=10, max_bytes=10)
+    cache.put(b"a", b"1234")
+    cache.put(b"b", b"5678")
+    assert cache.size_bytes == 8
+
+    # Exceeds the budget, so the least recently used entry goes
+    cache.put(b"c", b"90ab")
+    assert cache.get(b"a") is None
+    assert cache.size_bytes == 8
+
+    # Replacing an entry accounts for the old body
+    cache.put(b"b", b"56")
+    assert cache.size_bytes == 6
+
+    # Larger than the whole budget: never cached
+    cache.put(b"d", b"x" * 11)
+    assert cache.get(b"d") is None
+    assert len(cache) == 2
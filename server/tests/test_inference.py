@@ -0,0 +1,89 @@
+"""Tests for token extraction and inference workers."""
+
+import json
+
+import orjson
+import pytest
+import spacy
+from spacy.attrs import IS_ALPHA, LEMMA, ORTH, POS
+
+from app.inference import (
+    build_token_payload,
+    extract_tokens,
+    init_worker,
+    run_pipe,
+    run_pipe_ndjson,
+)
+from app.models import model_registry
+
+
+def test_extract_tokens_mixed_fields():
+    """Test extraction of string and boolean fields."""
+    nlp = spacy.blank("en")
+    doc = nlp("Hello 42")
+
+    assert extract_tokens(doc, (ORTH, IS_ALPHA)) == [
+        ["Hello", True],
+        ["42", False],
+    ]
+
+
+def test_build_token_payload_columns_layout():
+    """Test column layout groups values by field across documents."""
+    nlp = spacy.blank("en")
+    docs = [nlp("Hello world"), nlp("Bye")]
+
+    payload = build_token_payload(docs, (ORTH, IS_ALPHA), ("text", "is_alpha"), "columns")
+    assert payload["tokens"] == {
+        "text": [["Hello", "world"], ["Bye"]],
+        "is_alpha": [[True, True], [True]],
+    }
+
+
+def test_build_token_payload_indexed_layout():
+    """Test indexed layout interns closed-vocabulary fields across documents."""
+    from spacy.tokens import Doc
+
+    nlp = spacy.blank("en")
+    docs = [
+        Doc(nlp.vocab, words=["Dogs", "bark"], pos=["NOUN", "VERB"]),
+        Doc(nlp.vocab, words=[]),
+        Doc(nlp.vocab, words=["Cats"], pos=["NOUN"]),
+    ]
+
+    payload = build_token_payload(docs, (ORTH, POS), ("text", "pos"), "indexed")
+    vocab = payload["vocab"]["pos"]
+    assert sorted(vocab) == ["NOUN", "VERB"]
+    assert payload["tokens"]["text"] == [["Dogs", "bark"], [], ["Cats"]]
+    assert [[vocab[i] for i in doc] for doc in payload["tokens"]["pos"]] == [
+        ["NOUN", "VERB"], [], ["NOUN"]
+    ]
+
+
+def test_run_pipe_in_worker(tmp_path):
+    """Test worker initialization and compact encoded output."""
+    model_dir = tmp_path / "blank_en"
+    spacy.blank("en").to_disk(model_dir)
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({
+        "models": [{"name": "blank_en", "language": "en", "path": str(model_dir)}]
+    }))
+
+    init_worker(str(config_path))
+    try:
+        result = run_pipe("blank_en", ["Hello world"], (ORTH, LEMMA), ("text", "lemma"))
+        assert orjson.loads(result["tokens"]) == [[["Hello", ""], ["world", ""]]]
+
+        result = run_pipe("blank_en", ["Hello world"], (ORTH,), ("text",))
+        assert orjson.loads(result["tokens"]) == [[["Hello"], ["world"]]]
+
+        lines = run_pipe_ndjson("blank_en", ["Hello", "world"], (ORTH,), 5)
+        assert [orjson.loads(line) for line in lines.splitlines()] == [
+            {"doc": 5, "tokens": [["Hello"]]},
+            {"doc": 6, "tokens": [["world"]]},
+        ]
+
+        with pytest.raises(RuntimeError):
+            run_pipe("nonexistent", ["Hello"], (ORTH,), ("text",))
+    finally:
+        model_registry.remove_model("blank_en")
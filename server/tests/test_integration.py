@@ -1,95 +1,171 @@
 """Integration tests for jsspacynlp server.
 
-These tests require a running server instance.
+These tests require a running server instance (see SERVER_URL in
+conftest.py) and are skipped at collection time when it does not accept
+connections.
 Run with: docker-compose up -d && pytest tests/test_integration.py
+
+Set JSSPACY_IN_PROC=1 to run them against the app in-process instead.
 """
 
-import pytest
-import requests
+import asyncio
+import logging
+import os
 import time
 
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.schemas import HealthResponse, InfoResponse, ModelsResponse
+
+
+# All tests share one server client, so keep them on the same xdist worker
+pytestmark = [pytest.mark.integration, pytest.mark.xdist_group("integration_ro")]
+
+logger = logging.getLogger(__name__)
 
-# Server URL - can be overridden with environment variable
-SERVER_URL = "http://localhost:8000"
+# Batch sizes for test_lemmatize_batch, smallest to largest
+BATCH_SIZES = [1, 10, 200]
+
+# Throughput floor for the largest batch, kept low so slow CI machines pass
+MIN_TOKENS_PER_SEC = float(os.getenv("JSSPACY_MIN_TOK_PER_SEC", "100"))
 
 
 @pytest.fixture(scope="module")
-def wait_for_server():
-    """Wait for server to be ready."""
-    max_retries = 30
-    retry_delay = 1
+def event_loop():
+    """Module-scoped event loop so the shared client outlives single tests."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
 
-    for i in range(max_retries):
-        try:
-            response = requests.get(f"{SERVER_URL}/health", timeout=5)
-            if response.status_code == 200:
-                print(f"\nServer is ready after {i + 1} attempts")
-                return
-        except requests.exceptions.RequestException:
-            pass
 
-        if i < max_retries - 1:
-            time.sleep(retry_delay)
+async def wait_for_server(client: httpx.AsyncClient, timeout: float = 30) -> bool:
+    """Wait for server to be ready.
 
-    pytest.skip("Server not available for integration tests")
+    The port may accept connections (e.g. through docker-proxy) before the
+    server has finished loading models, so /health is polled with
+    exponential backoff from 0.1s up to 1s between attempts.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.1
 
+    while True:
+        try:
+            if (await client.get("/health", timeout=2)).is_success:
+                return True
+        except httpx.TransportError:
+            pass
 
-@pytest.mark.integration
-def test_server_health(wait_for_server):
+        if time.monotonic() + delay > deadline:
+            return False
+        await asyncio.sleep(delay)
+        delay = min(delay * 1.5, 1.0)
+
+
+@pytest_asyncio.fixture(scope="module")
+async def http(server_url):
+    """Shared async HTTP client so all tests reuse keep-alive connections.
+
+    With JSSPACY_IN_PROC set, requests are dispatched straight to the ASGI
+    app in this process (lifespan included) instead of over TCP.
+    """
+    if os.getenv("JSSPACY_IN_PROC"):
+        from app.main import app
+        from app.models import model_registry
+
+        async with app.router.lifespan_context(app):
+            if not model_registry.list_models():
+                pytest.fail(
+                    "No models loaded in-process; point JSSPACYNLP_MODELS_CONFIG_DIR "
+                    "at a model config (see CONTRIBUTING.md)"
+                )
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://test",
+                timeout=30,
+            ) as client:
+                yield client
+        return
+
+    async with httpx.AsyncClient(
+        base_url=server_url,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=30,
+    ) as client:
+        if not await wait_for_server(client):
+            pytest.skip("Server not available for integration tests")
+        yield client
+
+
+@pytest_asyncio.fixture(scope="module")
+async def available_models(http):
+    """Models advertised by the server, fetched once per module."""
+    response = await http.get("/models")
+    return response.json()["available_models"]
+
+
+async def test_server_health(http):
     """Test server health endpoint."""
-    response = requests.get(f"{SERVER_URL}/health")
+    response = await http.get("/health")
 
     assert response.status_code == 200
     data = response.json()
 
+    HealthResponse.model_validate(data, strict=True)
     assert data["status"] == "healthy"
-    assert "models_loaded" in data
-    assert "uptime_seconds" in data
-    assert isinstance(data["uptime_seconds"], (int, float))
 
 
-@pytest.mark.integration
-def test_server_info(wait_for_server):
+async def test_server_info(http):
     """Test server info endpoint."""
-    response = requests.get(f"{SERVER_URL}/info")
+    response = await http.get("/info")
 
     assert response.status_code == 200
     data = response.json()
 
+    InfoResponse.model_validate(data, strict=True)
     assert data["name"] == "jsspacynlp"
-    assert "version" in data
-    assert "spacy_version" in data
-    assert "models_loaded" in data
 
 
-@pytest.mark.integration
-def test_list_models(wait_for_server):
+async def test_list_models(http):
     """Test models listing endpoint."""
-    response = requests.get(f"{SERVER_URL}/models")
+    response = await http.get("/models")
 
     assert response.status_code == 200
     data = response.json()
 
-    assert "available_models" in data
-    assert isinstance(data["available_models"], list)
+    ModelsResponse.model_validate(data, strict=True)
 
 
-@pytest.mark.integration
-def test_lemmatize_with_available_model(wait_for_server):
-    """Test lemmatization if models are available."""
-    # First check what models are available
-    response = requests.get(f"{SERVER_URL}/models")
-    models_data = response.json()
+async def test_endpoints_concurrent(http):
+    """Test that independent endpoints answer correctly when hit concurrently."""
+    health, info, models, openapi = await asyncio.gather(
+        http.get("/health"),
+        http.get("/info"),
+        http.get("/models"),
+        http.get("/openapi.json"),
+    )
+
+    assert all(
+        response.status_code == 200 for response in (health, info, models, openapi)
+    )
+    assert HealthResponse.model_validate(health.json(), strict=True).status == "healthy"
+    assert InfoResponse.model_validate(info.json(), strict=True).name == "jsspacynlp"
+    ModelsResponse.model_validate(models.json(), strict=True)
+    assert "paths" in openapi.json()
 
-    if not models_data["available_models"]:
+
+async def test_lemmatize_with_available_model(http, available_models):
+    """Test lemmatization if models are available."""
+    if not available_models:
         pytest.skip("No models loaded on server")
 
     # Use the first available model
-    model_name = models_data["available_models"][0]["name"]
+    model_name = available_models[0]["name"]
 
     # Test lemmatization
-    response = requests.post(
-        f"{SERVER_URL}/lemmatize",
+    response = await http.post(
+        "/lemmatize",
         json={
             "model": model_name,
             "texts": ["Hello world", "Testing lemmatization"],
@@ -117,11 +193,10 @@ def test_lemmatize_with_available_model(wait_for_server):
     assert len(first_token) == 3  # text, lemma, pos
 
 
-@pytest.mark.integration
-def test_lemmatize_invalid_model(wait_for_server):
+async def test_lemmatize_invalid_model(http):
     """Test lemmatization with invalid model."""
-    response = requests.post(
-        f"{SERVER_URL}/lemmatize",
+    response = await http.post(
+        "/lemmatize",
         json={
             "model": "nonexistent_model_12345",
             "texts": ["Hello world"]
@@ -135,11 +210,10 @@ def test_lemmatize_invalid_model(wait_for_server):
     assert "nonexistent_model_12345" in data["error"]
 
 
-@pytest.mark.integration
-def test_lemmatize_empty_texts(wait_for_server):
+async def test_lemmatize_empty_texts(http):
     """Test lemmatization with empty texts array."""
-    response = requests.post(
-        f"{SERVER_URL}/lemmatize",
+    response = await http.post(
+        "/lemmatize",
         json={
             "model": "test_model",
             "texts": []
@@ -149,47 +223,58 @@ def test_lemmatize_empty_texts(wait_for_server):
     assert response.status_code == 422  # Validation error
 
 
-@pytest.mark.integration
-def test_lemmatize_batch(wait_for_server):
-    """Test batch lemmatization if models available."""
-    response = requests.get(f"{SERVER_URL}/models")
-    models_data = response.json()
-
-    if not models_data["available_models"]:
+@pytest.mark.parametrize("n", BATCH_SIZES)
+async def test_lemmatize_batch(http, available_models, n):
+    """Test batch lemmatization preserves input order and keeps up throughput."""
+    if not available_models:
         pytest.skip("No models loaded on server")
 
-    model_name = models_data["available_models"][0]["name"]
+    model_name = available_models[0]["name"]
+    texts = [f"Test sentence number {i}" for i in range(n)]
 
-    # Create batch of 50 texts
-    texts = [f"Test sentence number {i}" for i in range(50)]
-
-    response = requests.post(
-        f"{SERVER_URL}/lemmatize",
+    start = time.perf_counter()
+    response = await http.post(
+        "/lemmatize",
         json={
             "model": model_name,
             "texts": texts
         }
     )
+    elapsed = time.perf_counter() - start
 
     assert response.status_code == 200
     data = response.json()
 
-    assert len(data["tokens"]) == 50
+    assert len(data["tokens"]) == n
     assert data["processing_time_ms"] > 0
 
+    # Documents come back in request order
+    for i, doc in enumerate(data["tokens"]):
+        assert doc[0][0] == "Test"
+        assert doc[-1][0] == str(i)
+
+    # Client wall time includes transport; processing_time_ms is server compute
+    tokens_sent = sum(len(text.split()) for text in texts)
+    logger.info(
+        "%d texts: %.1f ms server, %.1f ms wall, %.0f tokens/s",
+        n, data["processing_time_ms"], elapsed * 1000, tokens_sent / elapsed
+    )
+
+    # Only the largest batch measures throughput; small ones are latency-bound
+    if n == BATCH_SIZES[-1]:
+        assert tokens_sent / elapsed > MIN_TOKENS_PER_SEC
+
 
-@pytest.mark.integration
-def test_api_documentation(wait_for_server):
+async def test_api_documentation(http):
     """Test that API documentation is accessible."""
     # Check OpenAPI JSON
-    response = requests.get(f"{SERVER_URL}/openapi.json")
+    response = await http.get("/openapi.json")
     assert response.status_code == 200
     openapi = response.json()
     assert "openapi" in openapi
     assert "paths" in openapi
 
     # Check Swagger UI (should return HTML)
-    response = requests.get(f"{SERVER_URL}/docs")
+    response = await http.get("/docs")
     assert response.status_code == 200
     assert "text/html" in response.headers.get("content-type", "")
-
@@ -3,46 +3,28 @@
 import pytest
 from fastapi import status
 
-
-def test_root_endpoint(client):
-    """Test root endpoint."""
-    response = client.get("/")
-    assert response.status_code == status.HTTP_200_OK
-    data = response.json()
-    assert "name" in data
-    assert data["name"] == "jsspacynlp"
-    assert "version" in data
-
-
-def test_health_endpoint(client):
-    """Test health check endpoint."""
-    response = client.get("/health")
-    assert response.status_code == status.HTTP_200_OK
-    data = response.json()
-    assert data["status"] == "healthy"
-    assert "models_loaded" in data
-    assert "uptime_seconds" in data
-    assert isinstance(data["uptime_seconds"], (int, float))
+from app import __version__
+from app.schemas import HealthResponse, InfoResponse, ModelsResponse
 
 
-def test_info_endpoint(client):
-    """Test info endpoint."""
-    response = client.get("/info")
+@pytest.mark.parametrize(
+    "path,schema,expected",
+    [
+        ("/", None, {"name": "jsspacynlp", "version": __version__}),
+        ("/health", HealthResponse, {"status": "healthy"}),
+        ("/info", InfoResponse, {"name": "jsspacynlp", "version": __version__}),
+        ("/models", ModelsResponse, {}),
+    ],
+)
+def test_get_endpoint(client, path, schema, expected):
+    """Test GET endpoints match their response schema and expected values."""
+    response = client.get(path)
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
-    assert data["name"] == "jsspacynlp"
-    assert "version" in data
-    assert "spacy_version" in data
-    assert "models_loaded" in data
-
-
-def test_models_endpoint(client):
-    """Test models list endpoint."""
-    response = client.get("/models")
-    assert response.status_code == status.HTTP_200_OK
-    data = response.json()
-    assert "available_models" in data
-    assert isinstance(data["available_models"], list)
+    if schema is not None:
+        schema.model_validate(data, strict=True)
+    for key, value in expected.items():
+        assert data[key] == value
 
 
 def test_lemmatize_no_model(client):
@@ -144,3 +126,387 @@ def test_lemmatize_invalid_fields(client, mock_model):
     assert "error" in data
     assert "invalid_field" in data["error"]
 
+
+def test_lemmatize_single_field(client, mock_model):
+    """Test lemmatize endpoint keeps one value per token for a single field."""
+    response = client.post(
+        "/lemmatize",
+        json={
+            "model": "test_model",
+            "texts": ["Hello world"],
+            "fields": ["is_alpha"]
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["tokens"] == [[[True], [True]]]
+
+
+def test_lemmatize_single_string_field(client, mock_model):
+    """Test a single string field keeps the token nesting in every endpoint."""
+    import json
+
+    body = {"model": "test_model", "texts": ["Hello world"], "fields": ["text"]}
+
+    response = client.post("/lemmatize", json=body)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["tokens"] == [[["Hello"], ["world"]]]
+
+    response = client.post("/lemmatize/stream", json=body)
+    assert response.status_code == status.HTTP_200_OK
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[1] == {"doc": 0, "tokens": [["Hello"], ["world"]]}
+
+
+def test_lemmatize_field_values(client, mock_model):
+    """Test lemmatize endpoint returns correct values for all fields."""
+    response = client.post(
+        "/lemmatize",
+        json={
+            "model": "test_model",
+            "texts": ["Hello world"],
+            "fields": [
+                "text", "lemma", "pos", "tag", "dep",
+                "ent_type", "is_alpha", "is_stop"
+            ]
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+
+    assert data["tokens"][0] == [
+        ["Hello", "hello", "NOUN", "NN", "ROOT", "", True, False],
+        ["world", "world", "NOUN", "NN", "ROOT", "", True, False],
+    ]
+
+
+def test_lemmatize_openapi_response_schema(client):
+    """Test lemmatize response schema is still documented in OpenAPI."""
+    response = client.get("/openapi.json")
+    assert response.status_code == status.HTTP_200_OK
+    schema = response.json()["paths"]["/lemmatize"]["post"]["responses"]["200"]
+    ref = schema["content"]["application/json"]["schema"]["$ref"]
+    assert ref.endswith("/LemmatizeResponse")
+
+
+def test_models_endpoint_with_model(client, mock_model):
+    """Test models list endpoint reflects registered models."""
+    response = client.get("/models")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/json"
+    models = response.json()["available_models"]
+    assert [m["name"] for m in models] == ["test_model"]
+    assert models[0]["type"] == "test"
+
+
+def test_lemmatize_batch_too_large(client, mock_model, monkeypatch):
+    """Test oversized batches fail validation like the request schema says."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "max_batch_size", 2)
+    response = client.post(
+        "/lemmatize",
+        json={"model": "test_model", "texts": ["a", "b", "c"]}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "exceeds maximum 2" in response.json()["details"]
+
+
+def test_lemmatize_text_too_long(client, mock_model, monkeypatch):
+    """Test lemmatize endpoint reports the first text over the length limit."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "max_text_length", 10)
+    response = client.post(
+        "/lemmatize",
+        json={
+            "model": "test_model",
+            "texts": ["short", "this text is too long", "also far too long"]
+        }
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    data = response.json()
+    assert "index 1" in data["error"]
+
+
+def test_resolve_fields_caches_valid_only():
+    """Test field resolution is memoized and invalid fields are not cached."""
+    from fastapi import HTTPException
+
+    from app.main import _resolve_fields
+
+    _resolve_fields.cache_clear()
+    attr_ids, annotations = _resolve_fields(("text", "lemma"))
+    assert annotations == ("text", "lemma")
+    assert len(attr_ids) == 2
+    assert _resolve_fields(("text", "lemma")) == (attr_ids, annotations)
+    assert _resolve_fields.cache_info().hits == 1
+
+    with pytest.raises(HTTPException) as exc_info:
+        _resolve_fields(("text", "invalid_field", "invalid_field"))
+    assert _resolve_fields.cache_info().currsize == 1
+    # Repeated invalid fields are only reported once
+    assert exc_info.value.detail["error"] == "Invalid fields: invalid_field"
+
+
+@pytest.mark.parametrize("body", [
+    b"{ invalid json }",
+    b'["not", "an", "object"]',
+    b'{"model": "test_model", "texts": "not a list"}',
+    b'{"model": "test_model", "texts": ["ok", 1]}',
+    b'{"model": "  ", "texts": ["Hello"]}',
+    b'{"model": "test_model", "texts": ["Hello"], "fields": "text"}',
+    b'{"model": "test_model", "texts": ["Hello"], "layout": "diagonal"}',
+])
+def test_lemmatize_malformed_request(client, mock_model, body):
+    """Test lemmatize endpoint rejects malformed request bodies."""
+    response = client.post(
+        "/lemmatize",
+        content=body,
+        headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "error" in response.json()
+
+
+def test_lemmatize_openapi_request_schema(client):
+    """Test lemmatize request body is still documented in OpenAPI."""
+    response = client.get("/openapi.json")
+    body = response.json()["paths"]["/lemmatize"]["post"]["requestBody"]
+    schema = body["content"]["application/json"]["schema"]
+    assert set(schema["required"]) == {"model", "texts"}
+
+
+def test_lemmatize_default_fields_values(client, mock_model):
+    """Test default fields values, including an empty document."""
+    response = client.post(
+        "/lemmatize",
+        json={
+            "model": "test_model",
+            "texts": ["Hello world", ""]
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+
+    assert data["tokens"] == [
+        [
+            ["Hello", "hello", "NOUN", "NN", "ROOT"],
+            ["world", "world", "NOUN", "NN", "ROOT"],
+        ],
+        [],
+    ]
+
+
+def test_lemmatize_columns_layout(client, mock_model):
+    """Test lemmatize endpoint with column layout."""
+    response = client.post(
+        "/lemmatize",
+        json={
+            "model": "test_model",
+            "texts": ["Hello world", "Bye"],
+            "fields": ["text", "lemma"],
+            "layout": "columns"
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+
+    assert data["annotations"] == ["text", "lemma"]
+    assert data["tokens"] == {
+        "text": [["Hello", "world"], ["Bye"]],
+        "lemma": [["hello", "world"], ["bye"]],
+    }
+
+
+def test_lemmatize_columns_layout_single_field(client, mock_model):
+    """Test column layout with a single requested field."""
+    response = client.post(
+        "/lemmatize",
+        json={
+            "model": "test_model",
+            "texts": ["Hello world", "Bye"],
+            "fields": ["lemma"],
+            "layout": "columns"
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["tokens"] == {"lemma": [["hello", "world"], ["bye"]]}
+
+
+def test_lemmatize_indexed_layout(client, mock_model):
+    """Test lemmatize endpoint with indexed layout."""
+    response = client.post(
+        "/lemmatize",
+        json={
+            "model": "test_model",
+            "texts": ["Hello world"],
+            "fields": ["text", "pos"],
+            "layout": "indexed"
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+
+    assert data["vocab"] == {"pos": ["NOUN"]}
+    assert data["tokens"] == {
+        "text": [["Hello", "world"]],
+        "pos": [[0, 0]],
+    }
+
+
+def test_lemmatize_indexed_layout_single_field(client, mock_model):
+    """Test indexed layout with a single interned field."""
+    response = client.post(
+        "/lemmatize",
+        json={
+            "model": "test_model",
+            "texts": ["Hello world", "Bye"],
+            "fields": ["pos"],
+            "layout": "indexed"
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+
+    assert data["vocab"] == {"pos": ["NOUN"]}
+    assert data["tokens"] == {"pos": [[0, 0], [0]]}
+
+
+def test_lemmatize_stream(client, mock_model):
+    """Test streaming lemmatize endpoint returns one NDJSON line per document."""
+    import json
+
+    texts = [f"Sentence {i}" for i in range(300)]
+    response = client.post(
+        "/lemmatize/stream",
+        json={
+            "model": "test_model",
+            "texts": texts,
+            "fields": ["text", "lemma"]
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0] == {"annotations": ["text", "lemma"], "model": "test_model"}
+    assert len(lines) == len(texts) + 1
+    assert [line["doc"] for line in lines[1:]] == list(range(len(texts)))
+    assert lines[300]["tokens"] == [["Sentence", "sentence"], ["299", "299"]]
+
+
+def test_lemmatize_stream_no_model(client):
+    """Test streaming lemmatize endpoint validates before streaming."""
+    response = client.post(
+        "/lemmatize/stream",
+        json={
+            "model": "nonexistent_model",
+            "texts": ["Hello world"]
+        }
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "nonexistent_model" in response.json()["error"]
+
+
+def test_lemmatize_response_cache(client, mock_model, monkeypatch):
+    """Test identical lemmatize requests are served from the cache."""
+    from app import main
+    from app.cache import ResponseCache
+
+    cache = ResponseCache(max_size=8, max_bytes=1 << 20)
+    monkeypatch.setattr(main, "_response_cache", cache)
+    calls = []
+    pipe = mock_model.pipe
+    monkeypatch.setattr(
+        mock_model, "pipe", lambda texts, **kwargs: calls.append(texts) or pipe(texts)
+    )
+
+    body = {"model": "test_model", "texts": ["Hello world"]}
+    first = client.post("/lemmatize", json=body)
+    second = client.post("/lemmatize", json=body)
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert first.content == second.content
+    assert len(calls) == 1
+    assert len(cache) == 1
+
+    # Errors are never cached
+    client.post("/lemmatize", json={"model": "nonexistent_model", "texts": ["Hi"]})
+    assert len(cache) == 1
+
+
+def test_cors_headers_only_for_cross_origin_requests(client):
+    """Test CORS headers are added only when an Origin header is sent."""
+    response = client.get("/health", headers={"Origin": "https://example.com"})
+    assert response.status_code == status.HTTP_200_OK
+    assert "access-control-allow-origin" in response.headers
+
+    response = client.get("/health")
+    assert response.status_code == status.HTTP_200_OK
+    assert "access-control-allow-origin" not in response.headers
+
+    preflight = client.options(
+        "/lemmatize",
+        headers={
+            "Origin": "https://example.com",
+            "Access-Control-Request-Method": "POST"
+        }
+    )
+    assert preflight.status_code == status.HTTP_200_OK
+
+
+def test_inference_pool_warm_and_restart(tmp_path, monkeypatch):
+    """Test workers load models at startup and a dead worker's pool is replaced."""
+    import json
+    import os
+    import signal
+    import time
+
+    import spacy
+    from fastapi.testclient import TestClient
+
+    from app import main
+    from app.config import settings
+    from app.models import model_registry
+
+    spacy.blank("en").to_disk(tmp_path / "blank_en")
+    (tmp_path / "config.json").write_text(json.dumps({
+        "models": [{"name": "blank_en", "language": "en", "path": str(tmp_path / "blank_en")}]
+    }))
+    monkeypatch.setattr(settings, "models_config_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "inference_workers", 1)
+
+    body = {"model": "blank_en", "texts": ["Hello world"], "fields": ["text"]}
+    try:
+        with TestClient(main.app) as client:
+            pool = main._inference_pool
+            assert pool is not None
+            # Warmed during startup, before any request
+            assert len(pool._processes) == 1
+
+            response = client.post("/lemmatize", json=body)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["tokens"] == [[["Hello"], ["world"]]]
+
+            response = client.post("/lemmatize/stream", json=body)
+            assert response.status_code == status.HTTP_200_OK
+            assert json.loads(response.text.splitlines()[1]) == {
+                "doc": 0, "tokens": [["Hello"], ["world"]]
+            }
+
+            for pid in list(pool._processes):
+                os.kill(pid, signal.SIGKILL)
+            response = client.post("/lemmatize", json=body)
+            assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+            assert main._inference_pool is not pool
+
+            # The replacement pool is warmed in the background
+            deadline = time.monotonic() + 30
+            while not main._inference_pool._processes and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert len(main._inference_pool._processes) == 1
+
+            response = client.post("/lemmatize", json=body)
+            assert response.status_code == status.HTTP_200_OK
+    finally:
+        model_registry.remove_model("blank_en")
@@ -1,12 +1,17 @@
 """Tests for model management."""
 
 import json
-import tempfile
 from pathlib import Path
 
 import pytest
 
-from app.models import ModelConfig, ModelRegistry
+from app.models import ModelConfig, ModelRegistry, model_registry
+
+
+@pytest.fixture
+def fresh_registry():
+    """An empty ModelRegistry, separate from the global model_registry."""
+    return ModelRegistry()
 
 
 def test_model_config_creation():
@@ -24,27 +29,92 @@ def test_model_config_creation():
     assert config.path == "en_core_web_sm"
 
 
-def test_model_registry_init():
-    """Test ModelRegistry initialization."""
+def test_model_config_batch_size():
+    """Test ModelConfig picks nlp.pipe batch size from model type."""
+    transformer = ModelConfig(
+        name="trf", language="en", model_type="transformer", path="en_core_web_trf"
+    )
+    small = ModelConfig(
+        name="sm", language="en", model_type="small", path="en_core_web_sm"
+    )
+
+    assert transformer.batch_size == 64
+    assert small.batch_size == 128
+
+
+def test_model_config_resolved_path(monkeypatch):
+    """Test ModelConfig resolves model paths once at construction."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "models_config_dir", "/models")
+
+    name = ModelConfig(name="a", language="en", model_type="small", path="en_core_web_sm")
+    assert name.is_package_name
+    assert name.resolved_path == "/models/en_core_web_sm"
+
+    relative = ModelConfig(name="b", language="en", model_type="custom", path="custom/model")
+    assert not relative.is_package_name
+    assert relative.resolved_path == "/models/custom/model"
+
+    absolute = ModelConfig(name="c", language="en", model_type="custom", path="/opt/model")
+    assert not absolute.is_package_name
+    assert absolute.resolved_path == "/opt/model"
+
+
+def test_load_model_from_models_dir(tmp_path, monkeypatch):
+    """Test loading a model directory relative to the models config dir."""
+    import spacy
+
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "models_config_dir", str(tmp_path))
+    spacy.blank("en").to_disk(tmp_path / "blank_en")
+
     registry = ModelRegistry()
-    
-    assert len(registry.models) == 0
-    assert len(registry.configs) == 0
-    assert registry.list_models() == []
+    registry.load_model(
+        ModelConfig(name="blank_en", language="en", model_type="custom", path="blank_en")
+    )
+    assert registry.list_models() == ("blank_en",)
+
+    with pytest.raises(RuntimeError):
+        registry.load_model(
+            ModelConfig(name="missing", language="en", model_type="custom", path="missing")
+        )
+
+
+def test_load_model_from_working_dir(tmp_path, monkeypatch):
+    """Test relative paths fall back to the working directory."""
+    import spacy
+
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "models_config_dir", str(tmp_path / "config"))
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "local").mkdir()
+    spacy.blank("en").to_disk(tmp_path / "local" / "blank_en")
+
+    registry = ModelRegistry()
+    registry.load_model(
+        ModelConfig(name="blank_en", language="en", model_type="custom", path="local/blank_en")
+    )
+    assert registry.list_models() == ("blank_en",)
+
+
+def test_model_registry_init(fresh_registry):
+    """Test ModelRegistry initialization."""
+    assert len(fresh_registry.models) == 0
+    assert len(fresh_registry.configs) == 0
+    assert fresh_registry.list_models() == ()
 
 
 def test_model_registry_list_models(mock_model):
     """Test listing models."""
-    from app.models import model_registry
-    
     models = model_registry.list_models()
     assert "test_model" in models
 
 
 def test_model_registry_get_model(mock_model):
     """Test getting a model."""
-    from app.models import model_registry
-    
     nlp = model_registry.get_model("test_model")
     assert nlp is not None
     
@@ -54,8 +124,6 @@ def test_model_registry_get_model(mock_model):
 
 def test_model_registry_get_model_info(mock_model):
     """Test getting model info."""
-    from app.models import model_registry
-    
     info = model_registry.get_model_info("test_model")
     assert info is not None
     assert info["name"] == "test_model"
@@ -66,42 +134,47 @@ def test_model_registry_get_model_info(mock_model):
     assert info_none is None
 
 
-def test_load_from_config_file_not_found():
+def test_load_from_config_file_not_found(fresh_registry):
     """Test loading from non-existent config file."""
-    registry = ModelRegistry()
-    
     # Should not raise, just log warning
-    registry.load_from_config(Path("/nonexistent/config.json"))
+    fresh_registry.load_from_config(Path("/nonexistent/config.json"))
     
-    assert len(registry.models) == 0
+    assert len(fresh_registry.models) == 0
 
 
-def test_load_from_config_empty_models():
+def test_load_from_config_empty_models(tmp_path, fresh_registry):
     """Test loading from config with no models."""
-    registry = ModelRegistry()
-    
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        json.dump({"models": []}, f)
-        config_path = Path(f.name)
-    
-    try:
-        registry.load_from_config(config_path)
-        assert len(registry.models) == 0
-    finally:
-        config_path.unlink()
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"models": []}))
+
+    fresh_registry.load_from_config(config_path)
+    assert len(fresh_registry.models) == 0
 
 
-def test_load_from_config_invalid_json():
+def test_load_from_config_invalid_json(tmp_path, fresh_registry):
     """Test loading from config with invalid JSON."""
-    registry = ModelRegistry()
-    
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        f.write("{ invalid json }")
-        config_path = Path(f.name)
-    
-    try:
-        with pytest.raises(json.JSONDecodeError):
-            registry.load_from_config(config_path)
-    finally:
-        config_path.unlink()
+    config_path = tmp_path / "config.json"
+    config_path.write_text("{ invalid json }")
+
+    with pytest.raises(json.JSONDecodeError):
+        fresh_registry.load_from_config(config_path)
+
+
+def test_model_registry_add_remove_model(fresh_registry):
+    """Test adding and removing models keeps cached views in sync."""
+    import spacy
+
+    config = ModelConfig(
+        name="blank_en",
+        language="en",
+        model_type="test",
+        path="en_core_web_sm"
+    )
+
+    fresh_registry.add_model(config, spacy.blank("en"))
+    assert fresh_registry.list_models() == ("blank_en",)
+    assert fresh_registry.get_model_info("blank_en")["language"] == "en"
 
+    fresh_registry.remove_model("blank_en")
+    assert fresh_registry.list_models() == ()
+    assert fresh_registry.get_model_info("blank_en") is None
@@ -0,0 +1,45 @@
+"""Tests for request schemas."""
+
+import orjson
+import pytest
+from pydantic import ValidationError
+
+from app.config import settings
+from app.schemas import LemmatizeRequest, parse_lemmatize_request
+
+
+def test_lemmatize_request_constraints():
+    """Test LemmatizeRequest field constraints."""
+    request = LemmatizeRequest(model="  en_core_web_sm ", texts=["Hello"])
+    assert request.model == "en_core_web_sm"
+
+    with pytest.raises(ValidationError):
+        LemmatizeRequest(model="   ", texts=["Hello"])
+    with pytest.raises(ValidationError):
+        LemmatizeRequest(model="en_core_web_sm", texts=[])
+    with pytest.raises(ValidationError):
+        LemmatizeRequest(
+            model="en_core_web_sm",
+            texts=["Hello"] * (settings.max_batch_size + 1)
+        )
+
+
+def test_parse_lemmatize_request():
+    """Test raw body parsing matches schema defaults."""
+    request = parse_lemmatize_request(b'{"model": " m ", "texts": ["Hello"]}')
+    assert request.model == "m"
+    assert request.texts == ["Hello"]
+    assert request.fields is None
+    assert request.layout == "rows"
+
+    with pytest.raises(ValueError):
+        parse_lemmatize_request(b'{"model": "m", "texts": []}')
+    with pytest.raises(ValueError, match="must be a string"):
+        parse_lemmatize_request(b'{"model": 5, "texts": ["Hello"]}')
+    with pytest.raises(ValueError, match="cannot be empty"):
+        parse_lemmatize_request(b'{"model": " ", "texts": ["Hello"]}')
+    with pytest.raises(ValueError, match="exceeds maximum"):
+        parse_lemmatize_request(orjson.dumps({
+            "model": "m",
+            "texts": ["Hello"] * (settings.max_batch_size + 1)
+        }))